@@ -7,30 +7,118 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
-from typing import Tuple
+import random
+from time import monotonic
+from typing import Dict, Tuple
 
 import httpx
+import orjson
 
-# HTTP client for the FX service. 
-# Attributes: base_url: Base URL for the FX service (e.g., http://localhost:4000). timeout_seconds: Per-request timeout in seconds. max_retries: Number of times to retry on failure.
-@dataclass
+# Request Timeout and Too Many Requests: the FX service is slow or overloaded, so backing off and retrying can succeed.
+_RETRYABLE_4XX = frozenset({408, 429})
+
+
+# Whether an FX response status is worth retrying.
+def _is_retryable_status(status_code: int) -> bool:
+    return status_code >= 500 or status_code in _RETRYABLE_4XX
+
+
+# Done-callback for single-flight tasks: marks the exception (if any) as retrieved.
+def _consume_outcome(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+# HTTP client for the FX service.
+# Wraps a long-lived, pooled httpx.AsyncClient (created once at app startup) so connections are reused across requests instead of paying a TCP/TLS handshake per call.
+# Quotes are cached per currency pair for a short TTL, since rates move on a scale of seconds-to-minutes.
+# Concurrent cache misses for the same pair are coalesced (single-flight): one detached task calls the FX service and every caller awaits its result.
+# Attributes: client: Shared httpx.AsyncClient whose base_url points at the FX service (e.g., http://localhost:4000). max_retries: Number of attempts for retryable failures (5xx, 408, 429, timeouts, connection errors). base_delay/max_delay/jitter: Exponential backoff between attempts, capped at max_delay with up to `jitter` proportional random spread. cache_ttl: Seconds a quote stays cached (0 disables caching).
 class FXClient:
-    base_url: str
-    timeout_seconds: float = 3.0
-    max_retries: int = 3
 
-    # Fetch an FX quote for a currency pair.
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        max_retries: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 5.0,
+        jitter: float = 0.5,
+        cache_ttl: float = 5.0,
+    ) -> None:
+        self._client = client
+        # Relative to the client's base_url; computed once instead of per call.
+        self._url = "/twirp/payments.v1.FXService/GetQuote"
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._cache_ttl = cache_ttl
+        # Maps (source_currency, dest_currency) → (rate, expires_at on the monotonic clock)
+        self._cache: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        # Maps (source_currency, dest_currency) → task for the FX call currently in progress
+        self._inflight: Dict[Tuple[str, str], asyncio.Task[Tuple[float, int]]] = {}
+
+    # Close the underlying connection pool. Called on app shutdown.
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    # Open a connection to the FX service ahead of the first real request, so DNS, TCP and TLS setup are already done.
+    # Any response (including 404) is fine; failures are ignored so an unavailable FX service does not block startup.
+    async def warmup(self, timeout_seconds: float = 2.0) -> None:
+        try:
+            await self._client.get("/", timeout=timeout_seconds)
+        except httpx.HTTPError:
+            pass
+
+    # Drop all cached quotes (useful in tests).
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    # Fetch an FX quote for a currency pair, serving it from the cache while fresh.
     async def get_quote(
         self, source_currency: str, dest_currency: str
     ) -> Tuple[float, int]:
         """
-        Returns (rate, latency_ms). Raises an exception on overall failure.
+        Returns (rate, latency_ms). latency_ms is 0 on a cache hit. Raises an exception on overall failure.
         """
         if not source_currency or not dest_currency:
             raise ValueError("source_currency and dest_currency are required")
 
-        url = f"{self.base_url}/twirp/payments.v1.FXService/GetQuote"
+        key = (source_currency, dest_currency)
+        cached = self._cache.get(key)
+        if cached is not None and monotonic() < cached[1]:
+            return cached[0], 0
+
+        # The FX call runs in its own task, shared by every caller for this pair (the first one included).
+        # shield() means cancelling one caller never cancels the shared call or the other callers.
+        # No await between the lookup and registering the task, so only one task is started per pair.
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._fetch_and_cache(key, source_currency, dest_currency)
+            )
+            # Retrieve the outcome so asyncio does not warn if every caller was cancelled before it finished.
+            task.add_done_callback(_consume_outcome)
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    # Body of the shared single-flight task: fetch, cache on success, and always unregister.
+    async def _fetch_and_cache(
+        self, key: Tuple[str, str], source_currency: str, dest_currency: str
+    ) -> Tuple[float, int]:
+        try:
+            rate, latency_ms = await self._fetch_quote(source_currency, dest_currency)
+            if self._cache_ttl > 0:
+                self._cache[key] = (rate, monotonic() + self._cache_ttl)
+            return rate, latency_ms
+        finally:
+            self._inflight.pop(key, None)
+
+    # Call the FX service (with retries) for a currency pair.
+    async def _fetch_quote(
+        self, source_currency: str, dest_currency: str
+    ) -> Tuple[float, int]:
+        # Built once; it is identical across retry attempts.
         payload = {
             "source_currency": source_currency,
             "target_currency": dest_currency,
@@ -39,37 +127,38 @@ class FXClient:
         last_exc: Exception | None = None
         latency_ms = 0
 
-        async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
-            for attempt in range(self.max_retries):
-                try:
-                    start = httpx.Timeout(0)
-                    # we'll track latency ourselves with monotonic
-                    import time
-
-                    t0 = time.monotonic()
-                    resp = await client.post(url, json=payload)
-                    latency_ms = int((time.monotonic() - t0) * 1000)
-
-                    if resp.status_code != 200:
-                        last_exc = RuntimeError(
-                            f"FX service returned status {resp.status_code}"
-                        )
-                    else:
-                        data = resp.json()
-                        rate = float(data.get("exchange_rate", 0.0))
-                        if rate <= 0:
-                            last_exc = RuntimeError(
-                                f"Invalid exchange rate from FX: {rate}"
-                            )
-                        else:
-                            # success
-                            return rate, latency_ms
-                except Exception as e:  # network or decode error
-                    last_exc = e
-
-                # backoff between retries, except after last
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(0.2 * (attempt + 1))
+        for attempt in range(self.max_retries):
+            try:
+                # we'll track latency ourselves with monotonic
+                t0 = monotonic()
+                resp = await self._client.post(self._url, json=payload)
+                latency_ms = int((monotonic() - t0) * 1000)
+            except httpx.TransportError as e:  # timeout or connection error
+                last_exc = e
+            else:
+                if resp.status_code == 200:
+                    # orjson decodes the raw body directly, skipping httpx's stdlib json path.
+                    data = orjson.loads(resp.content)
+                    rate = float(data.get("exchange_rate", 0.0))
+                    if rate <= 0:
+                        raise RuntimeError(f"Invalid exchange rate from FX: {rate}")
+                    # success
+                    return rate, latency_ms
+
+                last_exc = RuntimeError(
+                    f"FX service returned status {resp.status_code}"
+                )
+                # 5xx, 408 and 429 are transient; other statuses (e.g. 400/401/403/404) mean the request itself is bad.
+                if not _is_retryable_status(resp.status_code):
+                    raise last_exc
+
+            # exponential backoff with jitter between retries, except after last
+            if attempt < self.max_retries - 1:
+                delay = min(
+                    self.max_delay,
+                    self.base_delay * (2 ** attempt) * (1 + random.random() * self.jitter),
+                )
+                await asyncio.sleep(delay)
 
         assert last_exc is not None
         raise last_exc
@@ -3,7 +3,7 @@
 # --------------------
 # Application entrypoint for the FastAPI-based payment service.
 # - Creates the FastAPI app.
-# - Instantiates global repository and FX client.
+# - Instantiates the repository and, on startup, the pooled FX client (both on app.state).
 # - Registers routes and middleware.
 # - Exposes a basic health check endpoint.
 
@@ -11,21 +11,27 @@ from __future__ import annotations
 
 import os
 
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .fx_client import FXClient
 from .repository import InMemoryPaymentRepository
 from .routers import router as payments_router
 
-# Global instances (used by Depends helpers in routers.py)
-repo = InMemoryPaymentRepository()
 fx_base_url = os.getenv("FX_BASE_URL", "http://localhost:4000")
-fx_client = FXClient(base_url=fx_base_url)
+# HTTP/2 lets concurrent FX calls multiplex over one connection. Set FX_HTTP2=0 if the FX server does not support it.
+fx_http2 = os.getenv("FX_HTTP2", "1").lower() not in ("0", "false", "no")
+# How long (seconds) an FX quote is reused for the same currency pair.
+fx_cache_ttl = float(os.getenv("FX_CACHE_TTL", "5.0"))
 
 app = FastAPI(
     title="Cross-Currency Payment Service",
     version="1.0.0",
+    # Used only by routes that return plain data (currently /health). Payment routes return bytes pre-encoded by
+    # TypeAdapters in routers.py, and error bodies come from FastAPI's exception handlers, which always use JSONResponse.
+    default_response_class=ORJSONResponse,
 )
 
 # Optional – helpful for local testing
@@ -37,8 +43,32 @@ app.add_middleware(
     allow_credentials=True,
 )
 
+# Shared instances live on app.state and are read by the Depends helpers in routers.py.
+app.state.repo = InMemoryPaymentRepository()
+
 app.include_router(payments_router)
 
+
+# Create a single pooled HTTP client for the FX service so connections (and TLS sessions) are reused across requests.
+@app.on_event("startup")
+async def startup() -> None:
+    client = httpx.AsyncClient(
+        base_url=fx_base_url,
+        timeout=httpx.Timeout(3.0),
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        http2=fx_http2,
+    )
+    app.state.fx_client = FXClient(client, cache_ttl=fx_cache_ttl)
+    # Establish the first pooled connection now rather than on the first payment.
+    await app.state.fx_client.warmup()
+
+
+# Release pooled connections on shutdown.
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await app.state.fx_client.aclose()
+
+
 # Simple health check endpoint for monitoring.
 @app.get("/health")
 async def health():
@@ -13,7 +13,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 # Represents the lifecycle status of a payment.
@@ -24,6 +24,8 @@ class PaymentStatus(str, Enum):
 
 # Stores diagnostic information about processing a payment, especially around the FX service call.
 class Diagnostics(BaseModel):
+    # Handlers fill in diagnostics in place, so assignments are not revalidated.
+    model_config = ConfigDict(validate_assignment=False, frozen=False)
 
     # How long the FX call took, in milliseconds (if available).
     fx_latency_ms: Optional[int] = Field(default=None)
@@ -47,9 +49,13 @@ class Payment(BaseModel):
     updated_at: datetime
     payout_currency: str
 
-    # Allows constructing this model from ORM-like objects if needed.
-    class Config:
-        from_attributes = True
+    # from_attributes allows constructing this model from ORM-like objects if needed.
+    # Handlers mutate payments in place (PENDING → SUCCEEDED/FAILED), so assignments are not revalidated.
+    model_config = ConfigDict(
+        from_attributes=True,
+        validate_assignment=False,
+        frozen=False,
+    )
 
 
 # Shape of the incoming JSON body for creating a payment.
@@ -60,10 +66,20 @@ class CreatePaymentRequest(BaseModel):
     source_currency: str
     destination_currency: str
 
-    @field_validator("sender", "receiver", "source_currency", "destination_currency")
+    # Normalization happens here, once, so handlers can use the fields as-is.
+    @field_validator("sender", "receiver")
     @classmethod
     def not_empty(cls, v: str) -> str:
-        if not v or not v.strip():
+        v = v.strip()
+        if not v:
+            raise ValueError("field must not be empty")
+        return v
+
+    @field_validator("source_currency", "destination_currency")
+    @classmethod
+    def currency_code(cls, v: str) -> str:
+        v = v.strip().upper()
+        if not v:
             raise ValueError("field must not be empty")
         return v
 
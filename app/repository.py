@@ -6,9 +6,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from threading import RLock
-from typing import Dict
+from contextlib import ExitStack
+from threading import Lock
+from typing import Dict, List, Tuple
 
 from .models import Payment
 
@@ -16,55 +16,86 @@ from .models import Payment
 class PaymentNotFound(Exception):
     pass
 
-# Dataclass representation of a Payment used for internal storage.
-# We store primitive types here (like dict for diagnostics) instead of nested Pydantic models to keep the storage layer decoupled from the API modeling library.
-@dataclass
-class PaymentRecord:
-    # A simple dataclass representation of Payment for storage
-    id: str
-    sender: str
-    receiver: str
-    amount: float
-    source_currency: str
-    destination_currency: str
-    status: str
-    payout_amount: float | None
-    fx_rate: float | None
-    error_message: str | None
-    diagnostics: dict
-    created_at: str
-    updated_at: str
-    payout_currency: str
+# Copy a payment for storage without a full deepcopy walk.
+# Every Payment field is immutable (str, float, datetime, enum) except diagnostics, so a shallow copy of both models is enough to isolate the stored snapshot from caller mutations.
+def _snapshot(payment: Payment) -> Payment:
+    return payment.model_copy(update={"diagnostics": payment.diagnostics.model_copy()})
 
 # Thread-safe in-memory implementation of a payment repository. For a real system, this would likely be replaced with a DB-backed repository.
+# Payments are spread over a fixed number of shards by hash(payment_id), each with its own lock, so concurrent writers only contend when they hit the same shard.
 class InMemoryPaymentRepository:
     
-    def __init__(self) -> None:
-        # Re-entrant lock to guard the internal map.
-        self._lock = RLock()
-        # Maps payment ID → PaymentRecord
-        self._payments: Dict[str, PaymentRecord] = {}
+    def __init__(self, num_shards: int = 16) -> None:
+        self._num_shards = num_shards
+        # Plain (non re-entrant) locks, one per shard; no method re-acquires a lock it holds.
+        self._locks = [Lock() for _ in range(num_shards)]
+        # Each shard maps payment ID → Payment. Stored instances are private snapshots: callers keep mutating their own copy (e.g. PENDING → SUCCEEDED), so writes store a copy (see _snapshot).
+        self._shards: List[Dict[str, Payment]] = [{} for _ in range(num_shards)]
+
+    # Index of the shard that owns a payment ID.
+    def _shard_index(self, payment_id: str) -> int:
+        return hash(payment_id) % self._num_shards
+
+    # Lock and map of the shard that owns a payment ID.
+    def _bucket(self, payment_id: str) -> Tuple[Lock, Dict[str, Payment]]:
+        i = self._shard_index(payment_id)
+        return self._locks[i], self._shards[i]
+
+    # Group snapshots of payments by the shard that owns them.
+    def _group_by_shard(self, payments: List[Payment]) -> Dict[int, List[Payment]]:
+        groups: Dict[int, List[Payment]] = {}
+        for payment in payments:
+            groups.setdefault(self._shard_index(payment.id), []).append(
+                _snapshot(payment)
+            )
+        return groups
 
     # Insert a new payment record. If the ID already exists, it will be overwritten (not ideal for a real system).
     def save(self, payment: Payment) -> None:
-        # Convert Pydantic Payment model into a PaymentRecord dataclass.
-        rec = PaymentRecord(**payment.model_dump())
-        with self._lock:
-            self._payments[payment.id] = rec
+        rec = _snapshot(payment)
+        lock, shard = self._bucket(payment.id)
+        with lock:
+            shard[payment.id] = rec
 
     # Update an existing payment record. Raises: PaymentNotFound: if the payment ID is not known.
     def update(self, payment: Payment) -> None:
-        with self._lock:
-            if payment.id not in self._payments:
+        rec = _snapshot(payment)
+        lock, shard = self._bucket(payment.id)
+        with lock:
+            if payment.id not in shard:
                 raise PaymentNotFound(payment.id)
-            self._payments[payment.id] = PaymentRecord(**payment.model_dump())
+            shard[payment.id] = rec
+
+    # Insert several payment records, taking each involved shard's lock once.
+    def save_many(self, payments: List[Payment]) -> None:
+        for i, recs in self._group_by_shard(payments).items():
+            shard = self._shards[i]
+            with self._locks[i]:
+                for rec in recs:
+                    shard[rec.id] = rec
+
+    # Update several existing payment records, taking each involved shard's lock once. Nothing is written if any ID is unknown. Raises: PaymentNotFound: for an unknown payment ID.
+    def update_many(self, payments: List[Payment]) -> None:
+        groups = self._group_by_shard(payments)
+        # Hold all involved shard locks for the check-then-write, acquired in index order to avoid deadlocks.
+        with ExitStack() as stack:
+            for i in sorted(groups):
+                stack.enter_context(self._locks[i])
+            for i, recs in groups.items():
+                for rec in recs:
+                    if rec.id not in self._shards[i]:
+                        raise PaymentNotFound(rec.id)
+            for i, recs in groups.items():
+                shard = self._shards[i]
+                for rec in recs:
+                    shard[rec.id] = rec
     
-    # Retrieve a payment by its ID.
+    # Retrieve a payment by its ID. The stored instance is returned without revalidation or copying, so treat it as read-only.
     def get(self, payment_id: str) -> Payment:
-        with self._lock:
-            rec = self._payments.get(payment_id)
+        lock, shard = self._bucket(payment_id)
+        with lock:
+            rec = shard.get(payment_id)
             if not rec:
                 raise PaymentNotFound(payment_id)
 
-        # Convert back to Payment
-        return Payment(**asdict(rec))
+        return rec
@@ -2,16 +2,20 @@
 # --------------------
 # Defines the HTTP routes for interacting with payments:
 # - POST /payments: create and process a new payment.
+# - POST /payments/batch: create and process several payments, fetching FX quotes concurrently.
 # - GET /payments/{payment_id}: retrieve an existing payment.
 #
 # Uses FastAPI's dependency injection to access the repository and FX client.
 
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
+from typing import Annotated, List
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import Field, TypeAdapter
 
 from .fx_client import FXClient
 from .models import CreatePaymentRequest, Payment, PaymentResponse, PaymentStatus, Diagnostics
@@ -19,24 +23,73 @@ from .repository import InMemoryPaymentRepository, PaymentNotFound
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
+# Largest accepted POST /payments/batch body. Each item may start its own FX call, so this keeps one batch
+# well inside the FX client's connection pool (max 100) instead of queueing calls until they time out.
+MAX_BATCH_SIZE = 50
 
-# Simple dependency injection helpers
-def get_repo() -> InMemoryPaymentRepository:
-    from .main import repo  # circular-safe import
+# Compiled once and used to serialize payments straight to JSON bytes.
+# The routes return these bytes in a Response instead of declaring response_model, which would validate the payment again.
+# The JSON contract is unchanged: PaymentResponse is structurally identical to Payment, and stays listed in `responses` for the OpenAPI schema.
+_PAYMENT_ADAPTER = TypeAdapter(Payment)
+_PAYMENT_LIST_ADAPTER = TypeAdapter(List[Payment])
 
-    return repo
 
+# Simple dependency injection helpers. Instances are stored on app.state by main.py.
+def get_repo(request: Request) -> InMemoryPaymentRepository:
+    return request.app.state.repo
 
-def get_fx_client() -> FXClient:
-    from .main import fx_client  # circular-safe import
 
-    return fx_client
+# The pooled FX client is created on app startup.
+def get_fx_client(request: Request) -> FXClient:
+    return request.app.state.fx_client
+
+
+# Build a new Payment in PENDING state from a validated request (fields are already normalized by CreatePaymentRequest).
+# Every value is either validated by CreatePaymentRequest or freshly generated with the right type, so model_construct skips revalidation.
+def _new_pending_payment(req: CreatePaymentRequest, now: datetime) -> Payment:
+    return Payment.model_construct(
+        id=uuid4().hex,
+        sender=req.sender,
+        receiver=req.receiver,
+        amount=req.amount,
+        source_currency=req.source_currency,
+        destination_currency=req.destination_currency,
+        status=PaymentStatus.PENDING,
+        payout_amount=None,
+        fx_rate=None,
+        error_message=None,
+        diagnostics=Diagnostics(),
+        created_at=now,
+        updated_at=now,
+        payout_currency=req.destination_currency,
+    )
+
+
+# Apply a successful FX quote: compute the payout and mark the payment SUCCEEDED.
+def _mark_succeeded(
+    payment: Payment, rate: float, latency_ms: int, now: datetime
+) -> None:
+    payment.diagnostics.fx_latency_ms = latency_ms
+    payment.fx_rate = rate
+    payout = payment.amount * rate
+    payment.payout_amount = payout
+    payment.status = PaymentStatus.SUCCEEDED
+    payment.updated_at = now
+
+
+# Record an FX failure in diagnostics and mark the payment FAILED.
+def _mark_failed(payment: Payment, exc: BaseException, now: datetime) -> None:
+    msg = str(exc)
+    payment.diagnostics.fx_error = msg
+    payment.error_message = msg
+    payment.status = PaymentStatus.FAILED
+    payment.updated_at = now
 
 
 @router.post(
     "",
-    response_model=PaymentResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": PaymentResponse}},
 )
 
 # Create and process a new payment.
@@ -51,26 +104,8 @@ async def create_payment(
     req: CreatePaymentRequest,
     repo: InMemoryPaymentRepository = Depends(get_repo),
     fx_client: FXClient = Depends(get_fx_client),
-) -> PaymentResponse:
-    now = datetime.now(timezone.utc)
-
-    # Initialize payment in PENDING state.
-    payment = Payment(
-        id=str(uuid4()),
-        sender=req.sender.strip(),
-        receiver=req.receiver.strip(),
-        amount=req.amount,
-        source_currency=req.source_currency.strip().upper(),
-        destination_currency=req.destination_currency.strip().upper(),
-        status=PaymentStatus.PENDING,
-        payout_amount=None,
-        fx_rate=None,
-        error_message=None,
-        diagnostics=Diagnostics(),
-        created_at=now,
-        updated_at=now,
-        payout_currency=req.destination_currency.strip().upper(),
-    )
+) -> Response:
+    payment = _new_pending_payment(req, datetime.now(timezone.utc))
 
     # Save initial PENDING state
     repo.save(payment)
@@ -80,19 +115,8 @@ async def create_payment(
         rate, latency_ms = await fx_client.get_quote(
             payment.source_currency, payment.destination_currency
         )
-        payment.diagnostics.fx_latency_ms = latency_ms
-        payment.fx_rate = rate
-        payout = payment.amount * rate
-        payment.payout_amount = payout
-        payment.status = PaymentStatus.SUCCEEDED
-        payment.updated_at = datetime.now(timezone.utc)
-        repo.update(payment)
     except Exception as exc:
-        msg = str(exc)
-        payment.diagnostics.fx_error = msg
-        payment.error_message = msg
-        payment.status = PaymentStatus.FAILED
-        payment.updated_at = datetime.now(timezone.utc)
+        _mark_failed(payment, exc, datetime.now(timezone.utc))
         repo.update(payment)
         # Upstream failure → Bad Gateway
         raise HTTPException(
@@ -100,18 +124,72 @@ async def create_payment(
             detail="Failed to obtain FX rate",
         )
 
-    return PaymentResponse(**payment.model_dump())
+    _mark_succeeded(payment, rate, latency_ms, datetime.now(timezone.utc))
+    repo.update(payment)
+
+    return Response(
+        content=_PAYMENT_ADAPTER.dump_json(payment),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": List[PaymentResponse]}},
+)
+
+# Create and process several payments at once.
+#    All payments are persisted in PENDING state, then their FX quotes are fetched concurrently,
+#    so the batch takes roughly as long as its slowest quote rather than the sum of all of them.
+#    Unlike POST /payments, a failed quote does not fail the request: that payment is returned
+#    (and stored) as FAILED with diagnostics, and the rest of the batch still completes.
+#    Between 1 and MAX_BATCH_SIZE payments are accepted per call; empty or larger bodies are rejected with 422.
+
+async def create_payments_batch(
+    reqs: Annotated[List[CreatePaymentRequest], Field(min_length=1, max_length=MAX_BATCH_SIZE)],
+    repo: InMemoryPaymentRepository = Depends(get_repo),
+    fx_client: FXClient = Depends(get_fx_client),
+) -> Response:
+    # One timestamp per phase is shared by the whole batch.
+    now = datetime.now(timezone.utc)
+    payments = [_new_pending_payment(req, now) for req in reqs]
+    repo.save_many(payments)
+
+    results = await asyncio.gather(
+        *[
+            fx_client.get_quote(p.source_currency, p.destination_currency)
+            for p in payments
+        ],
+        return_exceptions=True,
+    )
+
+    now = datetime.now(timezone.utc)
+    for payment, result in zip(payments, results):
+        if isinstance(result, BaseException):
+            _mark_failed(payment, result, now)
+        else:
+            rate, latency_ms = result
+            _mark_succeeded(payment, rate, latency_ms, now)
+    repo.update_many(payments)
+
+    return Response(
+        content=_PAYMENT_LIST_ADAPTER.dump_json(payments),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
 
 
 @router.get(
     "/{payment_id}",
-    response_model=PaymentResponse,
     status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: {"model": PaymentResponse}},
 )
 async def get_payment(
     payment_id: str,
     repo: InMemoryPaymentRepository = Depends(get_repo),
-) -> PaymentResponse:
+) -> Response:
     try:
         payment = repo.get(payment_id)
     except PaymentNotFound:
@@ -120,4 +198,7 @@ async def get_payment(
             detail="Payment not found",
         )
 
-    return PaymentResponse(**payment.model_dump())
+    return Response(
+        content=_PAYMENT_ADAPTER.dump_json(payment),
+        media_type="application/json",
+    )
@@ -0,0 +1,13 @@
+# tests/conftest.py
+# --------------------
+# Makes the `app` package importable when running plain `pytest` from the repo root
+# (python -m pytest already adds the current directory to sys.path).
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
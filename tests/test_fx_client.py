@@ -0,0 +1,136 @@
+# tests/test_fx_client.py
+# --------------------
+# Tests for FXClient against an in-process httpx.MockTransport (no FX service needed).
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.fx_client import FXClient
+
+
+# Build an FXClient whose HTTP calls are answered by `handler`. Backoff delays are tiny to keep tests fast.
+def make_client(handler, **kwargs) -> FXClient:
+    client = httpx.AsyncClient(
+        base_url="http://fx.test", transport=httpx.MockTransport(handler)
+    )
+    kwargs.setdefault("base_delay", 0.001)
+    return FXClient(client, **kwargs)
+
+
+def quote(rate: float) -> httpx.Response:
+    return httpx.Response(200, json={"exchange_rate": rate})
+
+
+def test_concurrent_misses_share_one_request():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return quote(1.5)
+
+    async def run():
+        fx = make_client(handler)
+        results = await asyncio.gather(*[fx.get_quote("USD", "EUR") for _ in range(5)])
+        assert [rate for rate, _ in results] == [1.5] * 5
+        assert calls == 1
+        # Served from the TTL cache afterwards.
+        assert await fx.get_quote("USD", "EUR") == (1.5, 0)
+        assert calls == 1
+        # clear_cache() forces a fresh upstream call.
+        fx.clear_cache()
+        await fx.get_quote("USD", "EUR")
+        assert calls == 2
+
+    asyncio.run(run())
+
+
+def test_cancelling_first_caller_does_not_affect_waiters():
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await release.wait()
+        return quote(1.25)
+
+    async def run():
+        fx = make_client(handler)
+        first = asyncio.create_task(fx.get_quote("USD", "EUR"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(fx.get_quote("USD", "EUR"))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert (await second)[0] == 1.25
+        assert first.cancelled()
+        assert fx._inflight == {}
+
+    asyncio.run(run())
+
+
+def test_failed_fetch_is_shared_and_unregistered():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(400)
+
+    async def run():
+        fx = make_client(handler)
+        results = await asyncio.gather(
+            *[fx.get_quote("USD", "EUR") for _ in range(3)], return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert calls == 1
+        assert fx._inflight == {}
+
+    asyncio.run(run())
+
+
+def make_status_handler(statuses):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses[len(calls)]
+        calls.append(status)
+        return quote(2.0) if status == 200 else httpx.Response(status)
+
+    return handler, calls
+
+
+def test_transient_statuses_are_retried():
+    for status in (500, 503, 408, 429):
+        handler, calls = make_status_handler([status, 200])
+        assert asyncio.run(make_client(handler).get_quote("USD", "EUR"))[0] == 2.0
+        assert calls == [status, 200]
+
+
+def test_client_errors_fail_fast():
+    for status in (400, 401, 403, 404):
+        handler, calls = make_status_handler([status, 200])
+        with pytest.raises(RuntimeError, match=str(status)):
+            asyncio.run(make_client(handler).get_quote("USD", "EUR"))
+        assert calls == [status]
+
+
+def test_connection_errors_are_retried_up_to_max_retries():
+    attempts = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectError("connection refused", request=request)
+
+    fx = make_client(handler, max_retries=3)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(fx.get_quote("USD", "EUR"))
+    assert attempts == 3
@@ -0,0 +1,47 @@
+# tests/test_models.py
+# --------------------
+# Tests for request parsing and normalization in CreatePaymentRequest.
+
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from app.models import CreatePaymentRequest
+
+
+def test_fields_are_normalized():
+    req = CreatePaymentRequest(
+        sender=" Alice ",
+        receiver="Bob ",
+        amount=10,
+        source_currency=" usd",
+        destination_currency="eur ",
+    )
+    assert (req.sender, req.receiver) == ("Alice", "Bob")
+    assert (req.source_currency, req.destination_currency) == ("USD", "EUR")
+
+
+def test_unknown_fields_are_ignored():
+    req = CreatePaymentRequest.model_validate(
+        {
+            "sender": "Alice",
+            "receiver": "Bob",
+            "amount": 10,
+            "source_currency": "USD",
+            "destination_currency": "EUR",
+            "reference": "invoice-42",
+        }
+    )
+    assert not hasattr(req, "reference")
+
+
+def test_blank_currency_is_rejected():
+    with pytest.raises(ValidationError):
+        CreatePaymentRequest(
+            sender="Alice",
+            receiver="Bob",
+            amount=10,
+            source_currency="  ",
+            destination_currency="EUR",
+        )
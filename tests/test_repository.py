@@ -0,0 +1,97 @@
+# tests/test_repository.py
+# --------------------
+# Tests for InMemoryPaymentRepository: snapshot isolation, serialization of stored payments and batch writes.
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from uuid import uuid4
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.models import Diagnostics, Payment, PaymentResponse, PaymentStatus
+from app.repository import InMemoryPaymentRepository, PaymentNotFound
+
+PAYMENT_ADAPTER = TypeAdapter(Payment)
+
+
+def make_payment(sender: str = "Alice") -> Payment:
+    now = datetime.now(timezone.utc)
+    return Payment(
+        id=uuid4().hex,
+        sender=sender,
+        receiver="Bob",
+        amount=100,
+        source_currency="USD",
+        destination_currency="EUR",
+        status=PaymentStatus.PENDING,
+        diagnostics=Diagnostics(),
+        created_at=now,
+        updated_at=now,
+        payout_currency="EUR",
+    )
+
+
+def test_stored_payment_serializes_like_payment_response():
+    repo = InMemoryPaymentRepository()
+    payment = make_payment()
+    repo.save(payment)
+    payment.diagnostics.fx_latency_ms = 12
+    payment.fx_rate = 0.92
+    payment.payout_amount = payment.amount * 0.92
+    payment.status = PaymentStatus.SUCCEEDED
+    payment.updated_at = datetime.now(timezone.utc)
+    repo.update(payment)
+
+    stored = repo.get(payment.id)
+    expected = PaymentResponse(**payment.model_dump()).model_dump_json().encode()
+    assert PAYMENT_ADAPTER.dump_json(stored) == expected
+
+
+def test_mutating_after_save_does_not_change_snapshot():
+    repo = InMemoryPaymentRepository()
+    payment = make_payment()
+    repo.save(payment)
+    before = PAYMENT_ADAPTER.dump_json(repo.get(payment.id))
+
+    payment.diagnostics.fx_error = "boom"
+    payment.diagnostics.fx_latency_ms = 99
+    payment.error_message = "boom"
+
+    stored = repo.get(payment.id)
+    assert stored.diagnostics is not payment.diagnostics
+    assert stored.diagnostics.fx_error is None
+    assert PAYMENT_ADAPTER.dump_json(stored) == before
+
+
+def test_update_unknown_payment_raises():
+    repo = InMemoryPaymentRepository()
+    with pytest.raises(PaymentNotFound):
+        repo.update(make_payment())
+
+
+def test_save_many_and_update_many_across_shards():
+    repo = InMemoryPaymentRepository(num_shards=4)
+    payments = [make_payment(f"sender-{i}") for i in range(20)]
+    repo.save_many(payments)
+
+    for payment in payments:
+        payment.error_message = "updated"
+    repo.update_many(payments)
+
+    assert all(repo.get(p.id).error_message == "updated" for p in payments)
+
+
+def test_update_many_writes_nothing_if_any_id_is_unknown():
+    repo = InMemoryPaymentRepository(num_shards=4)
+    known = [make_payment(f"sender-{i}") for i in range(10)]
+    repo.save_many(known)
+
+    for payment in known:
+        payment.error_message = "updated"
+    with pytest.raises(PaymentNotFound):
+        repo.update_many(known + [make_payment("unknown")])
+
+    assert all(repo.get(p.id).error_message is None for p in known)
@@ -0,0 +1,67 @@
+# tests/test_routers.py
+# --------------------
+# Tests for the /payments routes. The FX client is replaced with one backed by httpx.MockTransport.
+
+from __future__ import annotations
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.fx_client import FXClient
+from app.main import app
+from app.routers import MAX_BATCH_SIZE, get_fx_client
+
+
+async def fx_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"exchange_rate": 0.5})
+
+
+@pytest.fixture
+def client():
+    fx = FXClient(
+        httpx.AsyncClient(base_url="http://fx.test", transport=httpx.MockTransport(fx_handler))
+    )
+    app.dependency_overrides[get_fx_client] = lambda: fx
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def payment_body(**overrides):
+    body = {
+        "sender": "Alice",
+        "receiver": "Bob",
+        "amount": 100,
+        "source_currency": "USD",
+        "destination_currency": "EUR",
+    }
+    body.update(overrides)
+    return body
+
+
+def test_create_and_get_payment(client):
+    resp = client.post("/payments", json=payment_body())
+    assert resp.status_code == 201
+    created = resp.json()
+    assert created["status"] == "SUCCEEDED"
+    assert created["payout_amount"] == 50.0
+
+    resp = client.get(f"/payments/{created['id']}")
+    assert resp.status_code == 200
+    assert resp.json() == created
+
+
+def test_batch_accepts_up_to_max_batch_size(client):
+    resp = client.post("/payments/batch", json=[payment_body()] * MAX_BATCH_SIZE)
+    assert resp.status_code == 201
+    assert len(resp.json()) == MAX_BATCH_SIZE
+
+
+def test_batch_rejects_oversized_body(client):
+    resp = client.post("/payments/batch", json=[payment_body()] * (MAX_BATCH_SIZE + 1))
+    assert resp.status_code == 422
+
+
+def test_batch_rejects_empty_body(client):
+    resp = client.post("/payments/batch", json=[])
+    assert resp.status_code == 422